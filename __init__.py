@@ -7,6 +7,7 @@ import re
 import os
 import time
 import random
+import sys
 from cudatext import *
 from cudatext_keys import *
 from cudax_lib import get_translation
@@ -59,7 +60,8 @@ NON_STANDARD_LEXERS = {
 
 # Lexers where we skip syntax parsing and just use Regex (Naive mode)
 # This is useful for plain text formats or where CudaText lexers don't output specific 'Id' styles.
-NAIVE_LEXERS = [
+# (frozenset: only used for membership tests)
+NAIVE_LEXERS = frozenset([
   'Markdown', # it has 'Text' rule for many chars, including punctuation+spaces
   'reStructuredText',
   'Textile',
@@ -69,7 +71,7 @@ NAIVE_LEXERS = [
   'JSON ^',
   'Ini files',
   'Ini files ^',
-]
+])
 
 MARKER_CODE = app_proc(PROC_GET_UNIQUE_TAG, '') # Generate a unique integer tag for this plugin's markers to avoid conflicts with other plugins
 DECOR_TAG = app_proc(PROC_GET_UNIQUE_TAG, '')  # Unique tag for gutter decorations
@@ -78,6 +80,9 @@ TOOLTIP_TEXT = _('Sync Editing: click to toggle')
 SCROLL_DEBOUNCE_DELAY = 150  # milliseconds to wait after scroll stops
 
 SHOW_PROGRESS=True
+# Smaller selections are processed too fast to need a progress bar (each update runs app_idle)
+PROGRESS_MIN_CHARS = 20000  # size decides, a single minified line can hold 100k+ tokens
+PROGRESS_MIN_LINES = 500    # fallback, for selections with many short lines
 
 
 # Check API version
@@ -236,7 +241,39 @@ class PluginConfig:
     def __init__(self):
         settings_dir = app_path(APP_DIR_SETTINGS)
         self.file_path = os.path.join(settings_dir, CONFIG_FILENAME)
+        self._data = {}  # Parsed INI file: {section_lower: {key_lower: value}}, None if the file could not be parsed
+        self._mtime = None
+        self.reload_if_changed()
+
+    def _get_mtime(self):
+        try:
+            return os.path.getmtime(self.file_path)
+        except OSError:
+            return None
+
+    def reload_if_changed(self):
+        """Parses the INI file again only if it was modified (e.g. edited by the user) since the last parse."""
+        mtime = self._get_mtime()
+        if mtime is not None and mtime == self._mtime:
+            return
+        self._parse()
         self.ensure_file()
+        self._mtime = self._get_mtime()
+
+    def _parse(self):
+        """Reads the whole INI file once, so key lookups are served from memory instead of one ini_read per key."""
+        import configparser  # imported on first use, to keep plugin loading (on every CudaText start) light
+        # RawConfigParser: no '%' interpolation, regex values must be returned as is
+        parser = configparser.RawConfigParser(strict=False)
+        try:
+            parser.read(self.file_path, encoding='utf-8-sig')
+        except (configparser.Error, UnicodeDecodeError) as ex:
+            # Fallback to ini_read for every key, it is more tolerant than configparser
+            print(_('ERROR: Sync Editing: Cannot parse config, reading keys one by one: ') + str(ex))
+            self._data = None
+            return
+        # sections are case-insensitive like in ini_read (keys are already lowercased by configparser)
+        self._data = {section.lower(): dict(parser[section]) for section in parser.sections()}
 
     def ensure_file(self):
         """Creates the config file if missing and populates default keys."""
@@ -244,6 +281,8 @@ class PluginConfig:
         for key, value in GLOBAL_DEFAULTS.items():
             if self._read_raw('global', key) is None:
                 ini_write(self.file_path, 'global', key, value)
+                if self._data is not None:
+                    self._data.setdefault('global', {})[key] = value
 
     def get_lexer_bool(self, lexer, key, default):
         raw = self._get_lexer_value(lexer, key)
@@ -271,30 +310,96 @@ class PluginConfig:
         return raw
 
     def _read_raw(self, section, key):
+        if self._data is not None:
+            return self._data.get(section.lower(), {}).get(key.lower())
         result = ini_read(self.file_path, section, key, self._SENTINEL)
         return None if result == self._SENTINEL else result
 
-def theme_color(name, is_font):
-    """Retrieves color from the current CudaText theme by fetching the dictionary fresh."""
-    # Load current IDE theme colors
-    theme = app_proc(PROC_THEME_SYNTAX_DICT_GET, '')
+_CONFIG = None  # Shared PluginConfig instance, see get_plugin_config()
+
+def get_plugin_config():
+    """
+    Returns the shared PluginConfig instance.
+    Values are read from disk again only when the INI file modification time changes,
+    so user edits are still picked up without restarting CudaText.
+    """
+    global _CONFIG
+    if _CONFIG is None:
+        _CONFIG = PluginConfig()
+    else:
+        _CONFIG.reload_if_changed()
+    return _CONFIG
+
+# Cache of compiled regexes: {pattern_string: re.Pattern}, shared by all sessions
+_REGEX_CACHE = {}
+
+def compile_cached(pattern):
+    """Compiles a regex once and reuses the same pattern object on the next sessions. Raises re.error for invalid patterns."""
+    regex = _REGEX_CACHE.get(pattern)
+    if regex is None:
+        regex = re.compile(pattern)
+        _REGEX_CACHE[pattern] = regex
+    return regex
+
+def match_identifier(regex, line, x):
+    """
+    Same as regex.match(line[x:]) but avoids copying the rest of the line when possible.
+    Matching in place with pos=x is only equivalent for patterns that do not look at the text before x (^, \b, lookbehind...), so it is used for the default pattern only.
+    Only group(0) of the result must be used (span differs between both forms).
+    """
+    if regex.pattern == IDENTIFIER_REGEX_DEFAULT:
+        return regex.match(line, x)
+    return regex.match(line[x:])
+
+def theme_color(name, is_font, theme=None):
+    """
+    Retrieves color from the current CudaText theme.
+    Pass 'theme' (result of PROC_THEME_SYNTAX_DICT_GET) when reading several colors, to fetch the dictionary only once.
+    """
+    if theme is None:
+        # Load current IDE theme colors
+        theme = app_proc(PROC_THEME_SYNTAX_DICT_GET, '')
     if name in theme:
         return theme[name]['color_font' if is_font else 'color_back']
     return 0x808080
 
-def generate_color(key):
-    # get random color for a given key
-    hash_val = hash(key) + random.randint(0, 0xFFFFFF)
+def generate_color(key, rdm=None):
+    # get random color for a given key, pass the same rdm offset to get consistent colors for a whole session
+    if rdm is None:
+        rdm = random.randint(0, 0xFFFFFF)
+    hash_val = hash(key) + rdm
     r = ((hash_val & 0xFF0000) >> 16) % 127 + 128
     g = ((hash_val & 0x00FF00) >> 8) % 127 + 128
     b = (hash_val & 0x0000FF) % 127 + 128
     return r | (g << 8) | (b << 16)
 
+def find_token_at(line_tokens, x):
+    """
+    Finds the token containing column x (start_x <= x <= end_x) in a line_index list [(TokenRef, key), ...].
+    The list is sorted by start_x, so we use a binary search instead of scanning the whole line (minified files can have 100k+ tokens per line).
+    Returns (TokenRef, key) or None. If two tokens touch at x, the first one is returned (like a linear scan would).
+    """
+    # Find the last token starting at or before x
+    lo, hi = 0, len(line_tokens)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if line_tokens[mid][0].start_x <= x:
+            lo = mid + 1
+        else:
+            hi = mid
+    # Walk back over tokens that also contain x (touching or zero-length deleted tokens)
+    found = None
+    i = lo - 1
+    while i >= 0 and line_tokens[i][0].end_x >= x:
+        found = line_tokens[i]
+        i -= 1
+    return found
+
 class TokenRef:
     """
     Mutable token reference for efficient in-place updates. this is better than immutable tuples because it avoids recreation overhead during edits.
     """
-    __slots__ = ['start_x', 'start_y', 'end_x', 'end_y', 'text', 'style']
+    __slots__ = ('start_x', 'start_y', 'end_x', 'end_y', 'text', 'style')
 
     def __init__(self, start_x, start_y, end_x, end_y, text, style):
         self.start_x = start_x
@@ -316,6 +421,16 @@ class SyncEditSession:
     Each editor handle has its own instance of this class to maintain state isolation.
     OPTIMIZED with spatial indexing for large files.
     """
+    # __slots__: faster attribute access in hot events (on_caret/on_click) and no per-instance __dict__
+    __slots__ = (
+        'selected', 'editing', 'line_index', 'dictionary',
+        'our_key', 'original', 'start_l', 'end_l', 'gutter_icon_line', 'gutter_icon_active',
+        'use_colors', 'use_simple_naive_mode', 'case_sensitive',
+        'identifier_regex', 'identifier_style_include', 'identifier_style_exclude', 'regex_identifier',
+        'marker_fg_color', 'marker_bg_color', 'marker_border_color', 'word_colors',
+        'original_occurrence_index', 'cached_carets_count', 'cached_carets_lines', 'text_version',
+    )
+
     def __init__(self):
         self.selected = False
         self.editing = False
@@ -361,6 +476,9 @@ class SyncEditSession:
         self.cached_carets_count = None   # Number of carets we expect
         self.cached_carets_lines = None   # List of y positions (line numbers (ordered)) where carets should be
 
+        # Text version (PROP_MODIFIED_VERSION) seen by the last redraw() of on_caret, None = unknown (always redraw)
+        self.text_version = None
+
 class Command:
     """
     Main Logic for Sync Editing.
@@ -380,6 +498,7 @@ class Command:
         self.active_scroll_handles = set() # Track editors with active sync sessions (for on_scroll event)
         self.active_caret_handles = set() # Track editors with active sync sessions (for on_caret event)
         self.selection_scroll_handles = set() # Track editors with selections but NO active session (for on_scroll event)
+        self.shown_icons = {} # {editor_handle: (line, active)} of the gutter icon currently shown, to skip redundant decor calls
 
     def _update_event_subscriptions(self):
         """
@@ -441,9 +560,9 @@ class Command:
         if handle in self.sessions:
             del self.sessions[handle]
 
-    def load_gutter_icons(self, ed_self):
+    def load_gutter_icons(self, ed_self, handle=None):
         """Load the gutter icon images into CudaText's imagelist."""
-        _h_ed = self.get_editor_handle(ed_self)
+        _h_ed = self.get_editor_handle(ed_self) if handle is None else handle
         if _h_ed not in self.inited_icon_eds:
             # print('Sync Editing: Loading icons:', ed_self.get_filename())
             self.inited_icon_eds.add(_h_ed)
@@ -461,6 +580,7 @@ class Command:
         if handle in self.inited_icon_eds:
             # print('Sync Editing: Forget handle')
             self.inited_icon_eds.remove(handle)
+        self.shown_icons.pop(handle, None)
 
         self.reset(ed_self)
 
@@ -472,27 +592,41 @@ class Command:
         """
         if self.has_session(ed_self):
             self.reset(ed_self)
+        # Forget the cached gutter icon only after reset() deleted it (show_gutter_icon re-checks the editor anyway)
+        self.shown_icons.pop(self.get_editor_handle(ed_self), None)
 
     def show_gutter_icon(self, ed_self, line_index, active=False):
         """Shows the gutter icon at the specified line."""
-        # Remove any existing gutter icon first
-        self.hide_gutter_icon(ed_self)
+        handle = self.get_editor_handle(ed_self)
 
-        # Choose icon based on active state
-        icon_index = self.icon_active if active else self.icon_inactive
+        # Skip decor calls if the same icon is already shown on this line (selection changes/scrolls usually keep the icon in place)
+        # The cache is confirmed with the editor: the decor moves with inserted/deleted lines, and can be cleared without us (e.g. on reload)
+        icon_shown = (self.shown_icons.get(handle) == (line_index, active)
+                      and any(decor['tag'] == DECOR_TAG for decor in ed_self.decor(DECOR_GET_ALL, line_index) or ()))
+        if not icon_shown:
+            # Remove any existing gutter icon first
+            ed_self.decor(DECOR_DELETE_BY_TAG, -1, DECOR_TAG)
 
-        ed_self.decor(DECOR_SET, line=line_index, tag=DECOR_TAG, text=''+chr(1)+TOOLTIP_TEXT, image=icon_index, auto_del=False)
+            # Choose icon based on active state
+            icon_index = self.icon_active if active else self.icon_inactive
 
-        if self.has_session(ed_self):
-            session = self.get_session(ed_self)
+            ed_self.decor(DECOR_SET, line=line_index, tag=DECOR_TAG, text=''+chr(1)+TOOLTIP_TEXT, image=icon_index, auto_del=False)
+            self.shown_icons[handle] = (line_index, active)
+
+        # single handle lookup (has_session + get_session would call PROP_HANDLE_SELF twice)
+        session = self.sessions.get(handle)
+        if session is not None:
             session.gutter_icon_line = line_index
             session.gutter_icon_active = True
 
     def hide_gutter_icon(self, ed_self):
         """Removes the gutter icon."""
-        ed_self.decor(DECOR_DELETE_BY_TAG, -1, DECOR_TAG)
-        if self.has_session(ed_self):
-            session = self.get_session(ed_self)
+        handle = self.get_editor_handle(ed_self)
+        # Nothing to delete if no icon is shown (this is the common case: caret moves without selection)
+        if self.shown_icons.pop(handle, None) is not None:
+            ed_self.decor(DECOR_DELETE_BY_TAG, -1, DECOR_TAG)
+        session = self.sessions.get(handle)
+        if session is not None:
             session.gutter_icon_line = None
             session.gutter_icon_active = False
 
@@ -503,34 +637,28 @@ class Command:
         Icon follows the viewport when scrolling through selection.
         Manages on_scroll subscription for selection tracking (separate from sync edit sessions).
         """
-        self.load_gutter_icons(ed_self)
-
         handle = self.get_editor_handle(ed_self)
 
         # Get the best line to show icon (viewport-aware)
         icon_line = self.get_visible_selection_line(ed_self)
 
         if icon_line is not None:
+            # Icons are needed only when we show them (caret moves without selection skip this)
+            self.load_gutter_icons(ed_self, handle)
+
             # Show icon at the calculated line
             self.show_gutter_icon(ed_self, icon_line)
 
             # Subscribe to on_scroll for this editor if NOT already in a sync edit session
             # This allows icon to follow viewport during scrolling
-            if not self.has_session(ed_self):
+            if handle not in self.sessions:
                 if handle not in self.selection_scroll_handles:
                     self.selection_scroll_handles.add(handle)
                     self._update_event_subscriptions()
         else:
             # No selection, hide icon if not in active sync edit mode
-            if self.has_session(ed_self):
-                session = self.get_session(ed_self)
-                if not session.selected and not session.editing:
-                    self.hide_gutter_icon(ed_self)
-                    # Unsubscribe from selection scroll tracking
-                    if handle in self.selection_scroll_handles:
-                        self.selection_scroll_handles.remove(handle)
-                        self._update_event_subscriptions()
-            else:
+            session = self.sessions.get(handle)
+            if session is None or (not session.selected and not session.editing):
                 self.hide_gutter_icon(ed_self)
                 # Unsubscribe from selection scroll tracking
                 if handle in self.selection_scroll_handles:
@@ -597,7 +725,7 @@ class Command:
         5. Builds spatial index for fast lookups. Builds spatial index (line_index) ONLY for valid words.
         6. Applies visual markers (colors) - ONLY FOR VISIBLE VIEWPORT PORTION.
 
-        All configuration is read fresh from file/theme on every start so the user does not need to restart CudaText.
+        Configuration changes are picked up on every start (the INI file is re-read when it was modified) so the user does not need to restart CudaText.
         """
         session = self.get_session(ed_self)
 
@@ -644,8 +772,8 @@ class Command:
         # Force naive way if lexer is none or lexer is one of the text file types
         is_naive_lexer = not cur_lexer or cur_lexer in NAIVE_LEXERS
 
-        # Instantiate config to get fresh values from disk on every session
-        ini_config = PluginConfig()
+        # Shared config, it is re-read from disk only if the file was modified since the last session
+        ini_config = get_plugin_config()
         use_simple_naive_mode = is_naive_lexer or ini_config.get_lexer_bool(cur_lexer, 'use_simple_naive_mode', USE_SIMPLE_NAIVE_MODE_DEFAULT)
 
         # Check if lexer is busy (only for non-naive lexers)
@@ -681,6 +809,7 @@ class Command:
         session.selected = True
         start_l = session.start_l
         end_l = session.end_l
+        show_progress = SHOW_PROGRESS and (len(original) >= PROGRESS_MIN_CHARS or end_l - start_l >= PROGRESS_MIN_LINES)
 
         # Break text selection and clear visual selection to show markers instead
         ed_self.set_sel_rect(0,0,0,0)
@@ -707,39 +836,40 @@ class Command:
         session.identifier_regex = ini_config.get_lexer_str(cur_lexer, 'identifier_regex', IDENTIFIER_REGEX_DEFAULT)
         session.identifier_style_exclude = ini_config.get_lexer_str(cur_lexer, 'identifier_style_exclude', IDENTIFIER_STYLE_EXCLUDE_DEFAULT)
 
-        # Set colors based on theme 'Id' and 'SectionBG4' styles
-        session.marker_fg_color = theme_color('Id', True)
-        session.marker_bg_color = theme_color('SectionBG4', False)
+        # Set colors based on theme 'Id' and 'SectionBG4' styles (fetch theme dictionary fresh, but only once)
+        theme = app_proc(PROC_THEME_SYNTAX_DICT_GET, '')
+        session.marker_fg_color = theme_color('Id', True, theme)
+        session.marker_bg_color = theme_color('SectionBG4', False, theme)
         session.marker_border_color = session.marker_fg_color
 
         # Compile regex patterns with fallbacks
         try:
-            session.regex_identifier = re.compile(session.identifier_regex)
+            session.regex_identifier = compile_cached(session.identifier_regex)
         except Exception:
             msg_status(_('Sync Editing: Invalid identifier_regex config - using fallback'))
             print(_('ERROR: Sync Editing: Invalid identifier_regex config - using fallback'))
-            session.regex_identifier = re.compile(IDENTIFIER_REGEX_DEFAULT)
+            session.regex_identifier = compile_cached(IDENTIFIER_REGEX_DEFAULT)
 
         try:
-            include_re = re.compile(session.identifier_style_include)
+            include_re = compile_cached(session.identifier_style_include)
         except Exception:
             msg_status(_('Sync Editing: Invalid identifier_style_include config - using fallback'))
             print(_('ERROR: Sync Editing: Invalid identifier_style_include config - using fallback'))
-            include_re = re.compile(local_styles_default)
+            include_re = compile_cached(local_styles_default)
 
         try:
-            exclude_re = re.compile(session.identifier_style_exclude)
+            exclude_re = compile_cached(session.identifier_style_exclude)
         except Exception:
             msg_status(_('Sync Editing: Invalid identifier_style_exclude config - using fallback'))
             print(_('ERROR: Sync Editing: Invalid identifier_style_exclude config - using fallback'))
-            exclude_re = re.compile(IDENTIFIER_STYLE_EXCLUDE_DEFAULT)
+            exclude_re = compile_cached(IDENTIFIER_STYLE_EXCLUDE_DEFAULT)
 
         # --- 4. Build Dictionary ---
 
         # NOTE: Do not use app_idle (set_progress) before EDACTION_LEXER_SCAN.
         # App_idle runs message processing which can conflict with parsing actions.
         # so do not use set_progress here before ed.action(EDACTION_LEXER_SCAN. see bug: https://github.com/Alexey-T/CudaText/issues/6120 the bug happen only with this line. Alexey said: app_idle is the main reason, it is bad to insert it before some parsing action. Usually app_idle is needed after some action, to run the app message processing. Not before. Dont use it if not nessesary...
-        # if SHOW_PROGRESS: self.set_progress(10)
+        # if show_progress: self.set_progress(10)
 
         # Run lexer scan from start. Force a Lexer scan to ensure tokens are up to date
         # EDACTION_LEXER_SCAN seems not needed anymore see:https://github.com/Alexey-T/CudaText/issues/6124
@@ -749,7 +879,7 @@ class Command:
             t_now = time.perf_counter()
             print(f"START_SYNC_EDIT 5% config: {t_now - t0:.4f}s ({t_now - t_prev:.4f}s)")
             t_prev = t_now
-        if SHOW_PROGRESS: self.set_progress(30)
+        if show_progress: self.set_progress(30)
 
         # Coordinate Correction
         x1, y1, x2, y2 = caret
@@ -764,19 +894,34 @@ class Command:
             x2 = ed_self.get_line_len(y2)
 
         # Pre-compute case sensitivity handler
-        key_normalizer = (lambda s: s) if session.case_sensitive else (lambda s: s.lower())
+        # Keys are interned: every occurrence of a word shares one string object (less memory on big files, and key comparisons hit the identity fast path)
+        intern = sys.intern
+        key_normalizer = intern if session.case_sensitive else (lambda s: intern(s.lower()))
+        # Normalize each distinct raw word only once: the same identifiers repeat all over the selection
+        key_cache = {}
+        get_cached_key = key_cache.get
 
         # --- 4. Step A: Build Dictionary AND Line Index ---
 
         # Use defaultdict (fastest for list appending workload)
         session.dictionary = defaultdict(list)
         session.line_index = defaultdict(list)
+        # Local bindings for the scan loops below (they run once per token)
+        dictionary = session.dictionary
+        line_index = session.line_index
         if session.use_simple_naive_mode:
             # === NAIVE MODE (Regex Only) ===
             # Naive Mode: Scan text purely by Regex, ignoring syntax context. This is generally faster as it bypasses ed.get_token
 
-            for y in range(start_l, end_l+1):
-                cur_line = ed_self.get_text_line(y)
+            # Fetch the whole selected block with ONE API call instead of one get_text_line() call per line
+            block = ed_self.get_text_substr(0, start_l, ed_self.get_line_len(end_l), end_l)
+            lines = block.split('\n')
+            if len(lines) != end_l - start_l + 1:
+                # Unexpected line breaks in the returned text, fallback to reading lines one by one
+                lines = [ed_self.get_text_line(y) for y in range(start_l, end_l+1)]
+
+            # Regex still runs per line, so user regexes with ^, $ or \s keep the same meaning as before
+            for y, cur_line in enumerate(lines, start_l):
                 for match in session.regex_identifier.finditer(cur_line):
                     mstart, mend = match.span()
                     matchg = match.group()
@@ -784,12 +929,14 @@ class Command:
                     if y == start_l and mstart < x1: continue
                     if y == end_l and mend > x2: continue
 
-                    key = key_normalizer(matchg)
+                    key = get_cached_key(matchg)
+                    if key is None:
+                        key = key_cache[matchg] = key_normalizer(matchg)
                     token_ref = TokenRef(mstart, y, mend, y, matchg, 'id')
 
                     # 2. Build dict and line_index
-                    session.dictionary[key].append(token_ref)
-                    session.line_index[y].append((token_ref, key))
+                    dictionary[key].append(token_ref)
+                    line_index[y].append((token_ref, key))
         else:
             # === LEXER MODE (Syntax Aware) ===
             # Standard Lexer Mode: Filter tokens by Style (Variable, Function, etc.)
@@ -800,7 +947,7 @@ class Command:
             if not tokenlist:
                 self.reset(ed_self)
                 msg_status(_('Sync Editing: No syntax tokens found'))
-                if SHOW_PROGRESS: self.set_progress(-1)
+                if show_progress: self.set_progress(-1)
                 # keep_selection=True because we are aborting
                 restore_caret(caret, keep_selection=True)
 
@@ -814,74 +961,76 @@ class Command:
                 t_now = time.perf_counter()
                 print(f"START_SYNC_EDIT 30% get_token: {t_now - t0:.4f}s ({t_now - t_prev:.4f}s)")
                 t_prev = t_now
-            if SHOW_PROGRESS: self.set_progress(60)
+            if show_progress: self.set_progress(60)
 
             # Pre-build style checks once for all unique styles
             # Build a set of all unique style strings first, then batch-check them
             unique_styles = {t['style'] for t in tokenlist}
             # Batch validate all unique styles at once (much faster than per-token)
+            include_match = include_re.match
+            exclude_match = exclude_re.match
             style_valid = {
-                style: bool(include_re.match(style) and not exclude_re.match(style))
+                style: bool(include_match(style) and not exclude_match(style))
                 for style in unique_styles
             }
+            is_style_valid = style_valid.get
 
             # Process tokens with immediate TokenRef creation
             for token in tokenlist:
                 # A. Drop tokens outside of selection
                 if token['y1'] == start_l and token['x1'] < x1: continue
-                if token['y2'] == end_l and token['x2'] > x2: continue
+                # Tokens come in document order, so every next one is past the selection end too
+                if token['y2'] == end_l and token['x2'] > x2: break
 
                 # B. Check if a token's style matches the allowed patterns (IDs) and rejects Keywords (O(1) dict lookup)
-                if not style_valid.get(token['style'], False):
+                if not is_style_valid(token['style'], False):
                     continue
 
                 # C. Add to dictionary AND line index in one pass
-                key = key_normalizer(token['str'])
-                token_ref = TokenRef(token['x1'], token['y1'], token['x2'], token['y2'], token['str'], token['style'])
+                token_str = token['str']
+                key = get_cached_key(token_str)
+                if key is None:
+                    key = key_cache[token_str] = key_normalizer(token_str)
+                token_ref = TokenRef(token['x1'], token['y1'], token['x2'], token['y2'], token_str, token['style'])
 
                 # Build dict and line_index.
-                session.dictionary[key].append(token_ref)
-                session.line_index[token['y1']].append((token_ref, key))
+                dictionary[key].append(token_ref)
+                line_index[token['y1']].append((token_ref, key))
 
         if ENABLE_BENCH_TIMER:
             t_now = time.perf_counter()
             print(f"START_SYNC_EDIT 60% Build dict+line: {t_now - t0:.4f}s ({t_now - t_prev:.4f}s)")
             t_prev = t_now
-        if SHOW_PROGRESS: self.set_progress(70)
+        if show_progress: self.set_progress(70)
 
         # --- 4 Step B: Remove Singletons (Clean garbage) ---
 
         # Filter dictionary and line_index simultaneously to avoid rebuilding line_index
-        keys_to_remove = [k for k, v in session.dictionary.items() if len(v) < 2]
-        for key in keys_to_remove:
-            # Get tokens before deleting
-            singleton_tokens = session.dictionary[key]
-            del session.dictionary[key]
-
-            # Remove from line_index (mark for removal)
-            for token_ref in singleton_tokens:
-                line_num = token_ref.start_y
-                if line_num in session.line_index:
-                    # Filter out this specific token_ref
-                    session.line_index[line_num] = [
-                        (ref, k) for ref, k in session.line_index[line_num]
-                        if ref is not token_ref
-                    ]
-                    # Clean up empty line entries
-                    if not session.line_index[line_num]:
-                        del session.line_index[line_num]
+        # Remember lines of the singleton tokens, then keep only duplicated words (one dict comprehension instead of a keys list + pop() loop)
+        # Still a defaultdict: on_click looks up keys that _cleanup_empty_word may have removed (deleted word), which must give [] and not KeyError
+        lines_to_filter = {v[0].start_y for v in session.dictionary.values() if len(v) < 2}
+        session.dictionary = defaultdict(list, {k: v for k, v in session.dictionary.items() if len(v) >= 2})
+
+        # Filter every affected line only ONCE (filtering it once per removed token is quadratic on lines with many unique words)
+        for line_num in lines_to_filter:
+            kept = [(ref, k) for ref, k in session.line_index[line_num] if k in session.dictionary]
+            if kept:
+                session.line_index[line_num] = kept
+            else:
+                # Clean up empty line entries
+                del session.line_index[line_num]
 
         if ENABLE_BENCH_TIMER:
             t_now = time.perf_counter()
             print(f"START_SYNC_EDIT 70% remove dup: {t_now - t0:.4f}s ({t_now - t_prev:.4f}s)")
             t_prev = t_now
-        if SHOW_PROGRESS: self.set_progress(85)
+        if show_progress: self.set_progress(85)
 
         # Validation: Ensure we actually found words to edit. Exit if no id's (eg: comments and etc)
         if not session.dictionary:
             self.reset(ed_self)
             msg_status(_('Sync Editing: No editable identifiers found in selection'))
-            if SHOW_PROGRESS: self.set_progress(-1)
+            if show_progress: self.set_progress(-1)
             # keep_selection=True because we are aborting
             restore_caret(caret, keep_selection=True)
 
@@ -896,12 +1045,8 @@ class Command:
         # Pre-generate all colors to maintain consistency of colors when switching between View and Edit mode, so words will have the same color always inside the same session, and this reduce overhead also
         if session.use_colors:
             rdm = random.randint(0, 0xFFFFFF)
-            session.word_colors = {
-                key: ((((hash(key) + rdm) & 0xFF0000) >> 16) % 127 + 128) |
-                     (((((hash(key) + rdm) & 0x00FF00) >> 8) % 127 + 128) << 8) |
-                     ((((hash(key) + rdm) & 0x0000FF) % 127 + 128) << 16)
-                for key in session.dictionary
-            }
+            # hash each key only once (the inline formula used to hash it 3 times)
+            session.word_colors = {key: generate_color(key, rdm) for key in session.dictionary}
         else:
             session.word_colors = {}
 
@@ -909,7 +1054,7 @@ class Command:
             t_now = time.perf_counter()
             print(f"START_SYNC_EDIT 85% gen colors: {t_now - t0:.4f}s ({t_now - t_prev:.4f}s)")
             t_prev = t_now
-        if SHOW_PROGRESS: self.set_progress(95)
+        if show_progress: self.set_progress(95)
 
         # --- 6. Apply Visual Markers (ONLY FOR VISIBLE VIEWPORT PORTION) ---
 
@@ -920,7 +1065,7 @@ class Command:
             t_now = time.perf_counter()
             print(f"START_SYNC_EDIT 95% mark_all_words: {t_now - t0:.4f}s ({t_now - t_prev:.4f}s)")
             t_prev = t_now
-        if SHOW_PROGRESS: self.set_progress(-1)
+        if show_progress: self.set_progress(-1)
 
         # Calculate summary statistics for the status bar message
         unique_duplicates_count = len(session.dictionary)
@@ -978,39 +1123,42 @@ class Command:
         # Collect markers only for visible VIEWPORT lines
         markers_to_add = []
 
-        for key in session.dictionary:
-            # Get pre-generated color for this word or generate a new color for new words (edited words become new words after edits)
-            color = session.word_colors.get(key)
-            if color is None:
-                color = generate_color(key)
-                session.word_colors[key] = color
-
-            for token_ref in session.dictionary[key]:
-                # OPTIMIZATION: Only add markers for the visible lines of the VIEWPORT
-                if line_top <= token_ref.start_y <= line_bottom:
-                    markers_to_add.append((
-                        token_ref.start_y,  # y
-                        token_ref.start_x,  # x
-                        token_ref.end_x - token_ref.start_x,  # len
-                        color
-                    ))
-
-        # Sort markers by (y, x) because this is what attr(MARKERS_ADD does internally, so we help it here to speed up things
+        # OPTIMIZATION: walk line_index over the visible lines only, instead of every token of the dictionary (scrolling a huge file used to rescan all of them)
+        # Markers must be added sorted by (y, x) because this is what attr(MARKERS_ADD does internally, so we help it here to speed up things
         # this is very important for big files, a 9mb javascript file with 400k duplicates takes 14min, with this it takes only 22s see: https://github.com/CudaText-addons/cuda_sync_editing/issues/23
-        markers_to_add.sort(key=lambda m: (m[0], m[1]))
+        # line_index rows are sorted by x and we walk lines in order, so markers come out already sorted (no sort needed)
+        # NOTE: do not group markers per word/color into separate batches, it breaks this global (y, x) order
+        line_index = session.line_index
+        word_colors = session.word_colors
+        for y in range(line_top, line_bottom + 1):
+            row = line_index.get(y)
+            if not row:
+                continue
+            for token_ref, key in row:
+                # Get pre-generated color for this word or generate a new color for new words (edited words become new words after edits)
+                color = word_colors.get(key)
+                if color is None:
+                    color = generate_color(key)
+                    word_colors[key] = color
+
+                markers_to_add.append((
+                    y,
+                    token_ref.start_x,  # x
+                    token_ref.end_x - token_ref.start_x,  # len
+                    color
+                ))
 
         # Add all markers in sorted order
+        # Only position and background differ between markers, build the other keyword arguments once
+        marker_kw = dict(
+            tag=MARKER_CODE,
+            color_font=0xb000000, # this color is better than marker_fg_color especially with black themes because we use colored background
+            color_border=0xb000000,
+            border_down=1
+        )
+        add_marker = ed_self.attr
         for y, x, length, color in markers_to_add:
-            ed_self.attr(MARKERS_ADD,
-                tag=MARKER_CODE,
-                x=x,
-                y=y,
-                len=length,
-                color_font=0xb000000, # this color is better than marker_fg_color especially with black themes because we use colored background
-                color_bg=color,
-                color_border=0xb000000,
-                border_down=1
-            )
+            add_marker(MARKERS_ADD, x=x, y=y, len=length, color_bg=color, **marker_kw)
 
     def _cleanup_empty_word(self, ed_self, session, word_key):
         """
@@ -1059,11 +1207,14 @@ class Command:
             return
 
         # Ensure the final edit is captured in dictionary
-        if self.caret_in_current_token(ed_self):
-            self.redraw(ed_self)
+        carets = ed_self.get_carets()
+        if self.caret_in_current_token(ed_self, carets, session):
+            self.redraw(ed_self, carets, session)
 
         # Remove the "Active Editing" markers (borders)
-        ed_self.attr(MARKERS_DELETE_BY_TAG, tag=MARKER_CODE)
+        # When colorizing, mark_all_words() below starts with the same delete, so do not pay for it twice
+        if not colorize:
+            ed_self.attr(MARKERS_DELETE_BY_TAG, tag=MARKER_CODE)
 
         # Check if the word was deleted (empty/zero-length)
         # If so, remove it from dictionary and line_index
@@ -1221,15 +1372,18 @@ class Command:
         if colorize:
             self.mark_all_words(ed_self)
 
-    def caret_in_current_token(self, ed_self):
+    def caret_in_current_token(self, ed_self, carets=None, session=None):
         """
         Helper: Checks if the primary caret is inside the word being edited.
+        carets, session: result of ed_self.get_carets() / self.get_session() if the caller already has them (saves API calls).
         """
-        session = self.get_session(ed_self)
+        if session is None:
+            session = self.get_session(ed_self)
         if not session.our_key:
             return False
 
-        carets = ed_self.get_carets()
+        if carets is None:
+            carets = ed_self.get_carets()
         if not carets:
             return False
 
@@ -1257,7 +1411,7 @@ class Command:
         actual_start_x = self._find_word_start(ed_self, session, line_text, x0)
 
         # 4. Check if this is a valid word match
-        match = session.regex_identifier.match(line_text[actual_start_x:])
+        match = match_identifier(session.regex_identifier, line_text, actual_start_x)
         if not match:
             # no match, the user deleted the word or caret is on an invalid word (space..etc)
 
@@ -1288,10 +1442,13 @@ class Command:
 
         # Count how many instances of 'our_key' are strictly BEFORE this one on the same line.
         # This tells us how many times 'delta' was applied before reaching us.
+        # tokens_list is sorted by (y, x), so those instances are right before idx: walk back only while we stay on line y0
+        # (O(occurrences on this line) instead of scanning all occurrences of the word on every caret move)
         tokens_on_line_before = 0
-        for t in tokens_list:
-            if t.start_y == y0 and t.start_x < token_ref.start_x:
-                tokens_on_line_before += 1
+        i = idx - 1
+        while i >= 0 and tokens_list[i].start_y == y0:
+            tokens_on_line_before += 1
+            i -= 1
 
         calculated_drift = tokens_on_line_before * delta
         expected_start_x = token_ref.start_x + calculated_drift
@@ -1363,10 +1520,10 @@ class Command:
         Uses spatial index for faster word lookups.
         """
         # exit early if sync edit mode is not active
-        if not self.has_session(ed_self):
+        session = self.sessions.get(self.get_editor_handle(ed_self))
+        if session is None:
             return
 
-        session = self.get_session(ed_self)
         if not session.selected and not session.editing:
             return
 
@@ -1377,15 +1534,14 @@ class Command:
         caret = carets[0]
         clicked_x, clicked_y = caret[0], caret[1]
 
-        # Find which word was clicked (fast O(1) lookup via line_index)
+        # Find which word was clicked (fast O(1) line lookup via line_index, then binary search inside the line)
         clicked_key = None
         offset = 0
         if clicked_y in session.line_index:
-            for token_ref, key in session.line_index[clicked_y]:
-                if clicked_x >= token_ref.start_x and clicked_x <= token_ref.end_x:
-                    clicked_key = key
-                    offset = clicked_x - token_ref.start_x
-                    break
+            found = find_token_at(session.line_index[clicked_y], clicked_x)
+            if found is not None:
+                token_ref, clicked_key = found
+                offset = clicked_x - token_ref.start_x
 
         # === PROFILING START: BENCHMARKING ID-to-ID SWITCH ===
         is_switch = session.editing and clicked_key is not None
@@ -1468,18 +1624,7 @@ class Command:
         markers_to_add.sort(key=lambda m: (m[0], m[1]))
 
         # Add active borders ONLY to visible VIEWPORT instances of the clicked word
-        for y, x, length in markers_to_add:
-            ed_self.attr(MARKERS_ADD, tag=MARKER_CODE,
-                x=x, y=y,
-                len=length,
-                color_font=session.marker_fg_color,
-                color_bg=session.marker_bg_color,
-                color_border=session.marker_border_color,
-                border_left=1,
-                border_right=1,
-                border_down=1,
-                border_up=1
-            )
+        self._add_edit_markers(ed_self, session, markers_to_add)
 
         # calling CARET_DELETE_ALL before CARET_OPTION_NO_SORT is necesary to get unique carets, otherwise we will need to call CARET_SORT after calling CARET_OPTION_NO_SORT
         ed_self.set_caret(0, 0, id=CARET_DELETE_ALL)
@@ -1516,6 +1661,7 @@ class Command:
         session.editing = True
         session.our_key = clicked_key
         session.original = (clicked_x, clicked_y)
+        session.text_version = None
 
         # Find which occurrence index this clicked word is (0-based).
         # Example: if "ccc" appears 3 times and user clicked the 2nd one, this will be index 1.
@@ -1550,18 +1696,17 @@ class Command:
         # Check if there's a decoration on this line with our tag
         decorations = ed_self.decor(DECOR_GET_ALL, nline)
 
-        for decor in decorations:
-            if decor['tag'] == DECOR_TAG:
-                # User clicked on our sync edit icon
-                session = self.get_session(ed_self)
+        if decorations and any(decor['tag'] == DECOR_TAG for decor in decorations):
+            # User clicked on our sync edit icon
+            session = self.get_session(ed_self)
 
-                if session.selected or session.editing:
-                    # If already in sync edit mode, exit
-                    self.reset(ed_self)
-                else:
-                    # Otherwise, start sync editing
-                    self.start_sync_edit(ed_self)
-                return False  # Prevent default processing
+            if session.selected or session.editing:
+                # If already in sync edit mode, exit
+                self.reset(ed_self)
+            else:
+                # Otherwise, start sync editing
+                self.start_sync_edit(ed_self)
+            return False  # Prevent default processing
 
     def on_caret_slow(self, ed_self):
         """
@@ -1613,8 +1758,11 @@ class Command:
         if is_mouse_click:
             return
 
+        # Read carets once and share them with the checks and redraw below (they do not move in between)
+        carets = ed_self.get_carets()
+
         # Check caret integrity FIRST: Detect if carets were lost or jumped to another line
-        if not self._validate_carets_integrity(ed_self):
+        if not self._validate_carets_integrity(ed_self, carets, session):
             msg_status(_("Carets removed or moved to different lines - exiting Sync Edit Mode"))
             # exit Edit mode
             self.finish_editing(ed_self, colorize=True)
@@ -1626,20 +1774,25 @@ class Command:
         # =================================
 
         # Now we are in Editing mode, and caret moved with keyboard and carets are in a good state, lets check if caret is still inside the edited word
-        if not self.caret_in_current_token(ed_self):
+        if not self.caret_in_current_token(ed_self, carets, session):
             # Caret left current token
             self.finish_editing(ed_self)
         else:
             # caret moved, and it is still inside the word currently being edited
-            # NOTE: self.redraw(ed_self) is called here to update word markers live during typing. This recalculates borders and shifts other tokens on the line as the word grows/shrinks. This is a performance hit on simple caret moves (arrow keys) but necessary for live updates.
-            self.redraw(ed_self)
+            # NOTE: self.redraw(ed_self) is called here to update word markers live during typing. This recalculates borders and shifts other tokens on the line as the word grows/shrinks.
+            # Simple caret moves (arrow keys) do not change the text, so redraw would find the same word and exit early anyway: skip it when the text version did not change since the last redraw
+            # (PROP_MODIFIED_VERSION is older than API_NEW, on older apps we always redraw)
+            text_version = ed_self.get_prop(PROP_MODIFIED_VERSION) if API_NEW else None
+            if text_version is None or text_version != session.text_version:
+                self.redraw(ed_self, carets, session)
+                session.text_version = text_version
 
         # === PROFILING STOP: ON_CARET (Exit Editing) ===
         if ENABLE_PROFILING_inside_on_caret:
             stop_profiling(pr_on_caret, s_on_caret, sort_key='cumulative', title='PROFILE: on_caret (Exit Editing)')
         # ===============================================
 
-    def _validate_carets_integrity(self, ed_self):
+    def _validate_carets_integrity(self, ed_self, current_carets=None, session=None):
         """
         Validates that carets are still in a valid state for sync editing.
         Returns True if carets are valid, False if they've been corrupted.
@@ -1656,7 +1809,8 @@ class Command:
         Why? when the user press left or right keyboard keys, if the carets are at the end of line and the user press left/right keys the carets at the end of line will jump to the next line while carets in the middle of line will continue inside the edited words, so this breaks editing words, so when this happens we have to exit sync edit mode and return to view/selection mode, so we have to make a cache of carets, and every time there is a carets movements we check the y position of all the current carets to the cached one and if one of them changed or the total of carets is diferent then we stop sync edit mode
         """
 
-        session = self.get_session(ed_self)
+        if session is None:
+            session = self.get_session(ed_self)
         if not session.editing or not session.our_key:
             return True
 
@@ -1672,7 +1826,8 @@ class Command:
             session.cached_carets_count = len(tokens)
             session.cached_carets_lines = [token.start_y for token in tokens]
 
-        current_carets = ed_self.get_carets()
+        if current_carets is None:
+            current_carets = ed_self.get_carets()
         if not current_carets:
             return False
 
@@ -1710,10 +1865,10 @@ class Command:
             return
 
         # Case 2: Editor has active sync edit session - handle marker updates
-        if not self.has_session(ed_self):
+        session = self.sessions.get(handle)
+        if session is None:
             return
 
-        session = self.get_session(ed_self)
         # Only update if we're in active mode
         if not (session.selected or session.editing):
             return
@@ -1738,10 +1893,10 @@ class Command:
         ed_self = Editor(editor_handle)
 
         # Check if this editor still has an active session
-        if not self.has_session(ed_self):
+        session = self.sessions.get(editor_handle)
+        if session is None:
             return
 
-        session = self.get_session(ed_self)
 
         # Update gutter icon position to middle of viewport (keep it always visible)
         if session.gutter_icon_active:
@@ -1795,18 +1950,35 @@ class Command:
         markers_to_add.sort(key=lambda m: (m[0], m[1]))
 
         # Draw active borders for the currently edited word
+        self._add_edit_markers(ed_self, session, markers_to_add)
+
+    def _add_edit_markers(self, ed_self, session, markers_to_add):
+        """
+        Adds the bordered markers of the edited word.
+        markers_to_add is a list of (y, x, len) already sorted by (y, x).
+        All these markers share the same style, so with the new API they are sent in a single MARKERS_ADD_MANY call.
+        """
+        if not markers_to_add:
+            return
+        # Same style for every marker, build the keyword arguments once
+        marker_kw = dict(
+            tag=MARKER_CODE,
+            color_font=session.marker_fg_color,
+            color_bg=session.marker_bg_color,
+            color_border=session.marker_border_color,
+            border_left=1,
+            border_right=1,
+            border_down=1,
+            border_up=1
+        )
+        if API_NEW:
+            # MARKERS_ADD_MANY is older than API_NEW, so every app with the new API has it
+            ys, xs, lens = zip(*markers_to_add)
+            ed_self.attr(MARKERS_ADD_MANY, x=list(xs), y=list(ys), len=list(lens), **marker_kw)
+            return
+        add_marker = ed_self.attr
         for y, x, length in markers_to_add:
-            ed_self.attr(MARKERS_ADD, tag=MARKER_CODE,
-                x=x, y=y,
-                len=length,
-                color_font=session.marker_fg_color,
-                color_bg=session.marker_bg_color,
-                color_border=session.marker_border_color,
-                border_left=1,
-                border_right=1,
-                border_down=1,
-                border_up=1
-            )
+            add_marker(MARKERS_ADD, x=x, y=y, len=length, **marker_kw)
 
     def on_key(self, ed_self, key, _state):
         """
@@ -1815,14 +1987,14 @@ class Command:
         2. VK_UP/DOWN/ENTER: BLock them to avoid caret desync / line breaking.
         """
         # OPTIMIZATION: exit early if sync edit mode is not active
-        if not self.has_session(ed_self):
+        session = self.sessions.get(self.get_editor_handle(ed_self))
+        if session is None:
             return
 
         if key == VK_ESCAPE:
             self.reset(ed_self)
             return False
 
-        session = self.get_session(ed_self)
         # Only check problematic keys during editing mode
         if not session.editing:
             return
@@ -1857,7 +2029,7 @@ class Command:
         actual_start_x = caret_x
 
         # Workaround for end of id case: If we are at the end of the line or word, step back one char to catch the word, otherwise when caret is at the end of the ID it will exit edit mode
-        if actual_start_x > 0 and (actual_start_x >= len(line_text) or not session.regex_identifier.match(line_text[actual_start_x:])):
+        if actual_start_x > 0 and (actual_start_x >= len(line_text) or not match_identifier(session.regex_identifier, line_text, actual_start_x)):
             actual_start_x -= 1
 
         # Move actual_start_x back until we find the beginning of the identifier as long as the regex matches the string starting at that position
@@ -1873,16 +2045,25 @@ class Command:
           ccc aaa
         without caret_x != 0 case2 works fine but case1 breaks'''
         if caret_x != 0:
+            if session.regex_identifier.pattern == IDENTIFIER_REGEX_DEFAULT:
+                # Fast path for the default r'\w+': walk back over word chars directly instead of slicing the line and calling the regex for every char
+                # (str.isalnum() or '_' is exactly what \w matches for str patterns)
+                while actual_start_x >= 0:
+                    c = line_text[actual_start_x:actual_start_x+1]
+                    if not (c.isalnum() or c == '_'):
+                        break
+                    actual_start_x -= 1
+                return actual_start_x + 1
             # Not at position 0: scan backward and adjust
             while actual_start_x >= 0:
-                if not session.regex_identifier.match(line_text[actual_start_x:]):
+                if not match_identifier(session.regex_identifier, line_text, actual_start_x):
                     break
                 actual_start_x -= 1
             actual_start_x += 1  # We went one step too far back
 
         return actual_start_x
 
-    def redraw(self, ed_self):
+    def redraw(self, ed_self, carets=None, session=None):
         """
         Dynamically updates markers and dictionary positions during typing.
         Because editing changes the length of the word, we must:
@@ -1907,7 +2088,8 @@ class Command:
             t0 = time.perf_counter()
         # ===============================
 
-        session = self.get_session(ed_self)
+        if session is None:
+            session = self.get_session(ed_self)
         if not session.our_key:
             # === PROFILING STOP: REDRAW (Exit Early 1) ===
             if ENABLE_PROFILING_inside_redraw:
@@ -1919,8 +2101,9 @@ class Command:
         old_key = session.our_key
         session.our_key = None # Temporarily unset to allow clean lookup
 
-        # Get current state at the first caret
-        carets = ed_self.get_carets()
+        # Get current state at the first caret (callers that already read the carets pass them in)
+        if carets is None:
+            carets = ed_self.get_carets()
         if not carets: return
 
         idx = session.original_occurrence_index
@@ -1941,7 +2124,7 @@ class Command:
         start_pos = self._find_word_start(ed_self, session, first_y_line, first_x)
 
         # Check if word became empty (deleted) or invalid. Workaround for empty id (eg. when it was deleted) #62
-        match = session.regex_identifier.match(first_y_line[start_pos:])
+        match = match_identifier(session.regex_identifier, first_y_line, start_pos)
 
         if not match:
             # no match, the user deleted the word or caret is on an invalid word (space..etc)
@@ -1970,6 +2153,7 @@ class Command:
             new_key = match.group(0)
             if not session.case_sensitive:
                 new_key = new_key.lower()
+            new_key = sys.intern(new_key)
             new_length = len(new_key)
 
         # 2. Calculate Length Delta change
@@ -1997,47 +2181,68 @@ class Command:
             # ==========================================
             return
 
-        # Identify lines affected by this edit (where this word appears)
-        affected_lines = set()
-        for token_ref in edited_tokens:
-            affected_lines.add(token_ref.start_y)  # y coordinate
-
         # 3. Rebuild Dictionary positions for the modified Active Word with new values (Delta shifting)
-        # Delta-based updates: For each edited token instance, apply delta and shift other tokens on same line
-        for token_ref in edited_tokens:
-            line_num = token_ref.start_y
-            old_token_x = token_ref.start_x
-
-            if new_length == 0:
-                # Word deleted - keep position but zero length
-                token_ref.end_x = token_ref.start_x
-                token_ref.text = ''
-            else:
+        # Delta-based updates: For each line, apply delta to the edited token instances and shift other tokens on that line
+        # One merged pass per line: both edited_tokens and line_index[line] are sorted by x, so a token must be shifted by delta once for every edited instance that ends before it (instead of rescanning the whole line for every edited instance, which is quadratic on minified lines full of duplicates)
+        # Lines affected by this edit (where this word appears) are collected in the same pass
+        affected_lines = set()
+        # Bind what the loops below use on every iteration to locals
+        line_index = session.line_index
+        find_word_start = self._find_word_start
+        get_text_line = ed_self.get_text_line
+        i = 0
+        n_edited = len(edited_tokens)
+        while i < n_edited:
+            line_num = edited_tokens[i].start_y
+            affected_lines.add(line_num)
+            j = i
+            while j < n_edited and edited_tokens[j].start_y == line_num:
+                j += 1
+            line_edited = edited_tokens[i:j]
+            i = j
+
+            # Old end of each edited instance (before any shifting). CRITICAL: tokens starting exactly at this end are shifted too (handles x=0 case, user delete a word at position x=0)
+            old_ends = [token_ref.start_x + old_length for token_ref in line_edited]
+
+            if new_length != 0:
                 # Find new word position (may have shifted due to earlier edits on same line)
-                y_line = ed_self.get_text_line(line_num)
-
-                # Scan backwards to find start of the new word instance from the adjusted position
-                # here we search for the token starting from its old position
-                search_x = self._find_word_start(ed_self, session, y_line, old_token_x)
+                # Fetched once per line, and the caret line was already read above (text does not change during redraw)
+                y_line = first_y_line if line_num == first_y else get_text_line(line_num)
+
+            for k, token_ref in enumerate(line_edited):
+                # Position of this instance after the k previous instances on this line changed their length
+                old_token_x = token_ref.start_x + k * delta
+
+                if new_length == 0:
+                    # Word deleted - keep position but zero length
+                    token_ref.start_x = old_token_x
+                    token_ref.end_x = old_token_x
+                    token_ref.text = ''
+                else:
+                    # Scan backwards to find start of the new word instance from the adjusted position
+                    # here we search for the token starting from its old position
+                    search_x = find_word_start(ed_self, session, y_line, old_token_x)
 
-                # Update this token's position in-place
-                token_ref.start_x = search_x
-                token_ref.end_x = search_x + new_length
-                token_ref.text = new_key
+                    # Update this token's position in-place
+                    token_ref.start_x = search_x
+                    token_ref.end_x = search_x + new_length
+                    token_ref.text = new_key
 
-            # Shift other tokens on this line that come AFTER this token
+            # Shift other tokens on this line that come AFTER the edited instances
             # Only process tokens on the same line (using spatial index)
-            # CRITICAL: Use >= old_token_x + old_length to handle x=0 case (user delete a word at position x=0)
-            if delta != 0 and line_num in session.line_index:
-                for other_ref, other_key in session.line_index[line_num]:
-                    # Skip the token we just updated
-                    if other_ref is token_ref:
+            if delta != 0 and line_num in line_index:
+                edited_ids = {id(token_ref) for token_ref in line_edited}
+                passed = 0
+                n_ends = len(old_ends)
+                for other_ref, other_key in line_index[line_num]:
+                    # Skip the tokens we just updated
+                    if id(other_ref) in edited_ids:
                         continue
-                    # Only shift tokens that come AFTER the end of the old word
-                    # If other token comes after this one, shift it
-                    # Use >= instead of > to handle x=0 case correctly
-                    if other_ref.start_x >= old_token_x + old_length:
-                        other_ref.shift(delta)
+                    # Count edited instances whose old end is at or before this token (use >= to handle x=0 case correctly)
+                    while passed < n_ends and other_ref.start_x >= old_ends[passed]:
+                        passed += 1
+                    if passed:
+                        other_ref.shift(delta * passed)
 
         '''
         # 4. met1: Update dictionary keys if word changed, and also handle collisions (when we edit a word and create a new word that already existed before, we merge both and consider them as one token so it become colorized with the same color), this seems the best thing but after more thinking i found it a bad idea, so i will use met2, see bellow. i keep code here to know/remember about this collision problem and why i took this decision because it is not obvious
@@ -2073,6 +2278,7 @@ class Command:
         # Update dictionary keys if word changed (and is not empty)
         if new_key != '' and old_key != new_key:
             # Word changed to a different non-empty word
+            dead_tokens = session.dictionary.get(new_key)
             session.dictionary[new_key] = edited_tokens
             del session.dictionary[old_key]
 
@@ -2084,6 +2290,17 @@ class Command:
                         for ref, key in session.line_index[line_num]
                     ]
 
+            # The old instances of new_key are dead words now: drop them from line_index too, so they are not colorized or clickable (line_index must only hold dictionary tokens, mark_all_words relies on it)
+            if dead_tokens:
+                dead_ids = {id(ref) for ref in dead_tokens}
+                for line_num in {ref.start_y for ref in dead_tokens}:
+                    if line_num in session.line_index:
+                        kept = [(ref, key) for ref, key in session.line_index[line_num] if id(ref) not in dead_ids]
+                        if kept:
+                            session.line_index[line_num] = kept
+                        else:
+                            del session.line_index[line_num]
+
             session.our_key = new_key
         else:
             # Word is empty or unchanged - keep using old_key
@@ -2122,18 +2339,7 @@ class Command:
         markers_to_add.sort(key=lambda m: (m[0], m[1]))
 
         # Draw active borders for the currently edited word (visible VIEWPORT portion only)
-        for y, x, length in markers_to_add:
-            ed_self.attr(MARKERS_ADD, tag=MARKER_CODE,
-                x=x, y=y,
-                len=length,
-                color_font=session.marker_fg_color,
-                color_bg=session.marker_bg_color,
-                color_border=session.marker_border_color,
-                border_left=1,
-                border_right=1,
-                border_down=1,
-                border_up=1
-            )
+        self._add_edit_markers(ed_self, session, markers_to_add)
 
         # === PROFILING STOP: REDRAW ===
         if ENABLE_PROFILING_inside_redraw:
@@ -2147,7 +2353,7 @@ class Command:
         """Opens the plugin configuration INI file."""
         session = self.get_session(ed)
         try:
-            ini_config = PluginConfig()
+            ini_config = get_plugin_config()
             file_open(ini_config.file_path)
         except Exception as ex:
             msg_status(_('Cannot open config: ') + str(ex))